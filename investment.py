@@ -1,6 +1,80 @@
+import math
+
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+
+def _simulate(
+    one_time_investment,
+    monthly_sip_amount,
+    annual_interest_rate,
+    monthly_interest_rate,
+    sip_duration_years,
+    total_investment_duration_years
+):
+    """
+    Computes the year-end values of the one-time investment and the SIP for every year.
+
+    Args:
+        one_time_investment (float): The initial lump sum investment.
+        monthly_sip_amount (float): The amount invested monthly via SIP.
+        annual_interest_rate (float): Annual interest rate as a decimal (e.g., 0.08).
+        monthly_interest_rate (float): Monthly interest rate as a decimal.
+        sip_duration_years (int): Duration for which monthly SIPs are made.
+        total_investment_duration_years (int): Total period the money remains invested.
+
+    Returns:
+        tuple: NumPy float64 arrays (one_time_values, sip_values, total_values),
+               one entry per year from year 1 to total_investment_duration_years.
+    """
+    # Each part is only simulated when it is actually invested in; a part that is
+    # not used stays at zero and its compounding is skipped entirely
+    has_one_time = one_time_investment > 0
+    has_sip = monthly_sip_amount > 0 and sip_duration_years > 0
+
+    # The three result arrays are allocated once and filled in place
+    one_time_values = np.zeros(total_investment_duration_years)
+    sip_values = np.zeros(total_investment_duration_years)
+    total_values = np.empty(total_investment_duration_years)
+
+    # Growth factors are computed once; each year then reuses the previous year's
+    # compounded value (running product) instead of raising to a fresh power
+    yearly_factor = 1 + annual_interest_rate
+
+    if has_one_time:
+        one_time_values.fill(yearly_factor)
+        np.cumprod(one_time_values, out=one_time_values)
+        one_time_values *= one_time_investment
+
+    if has_sip:
+        # (1 + r)**n - 1 is evaluated as expm1(n * log1p(r)), which stays accurate for small rates
+        monthly_growth_12 = math.expm1(12 * math.log1p(monthly_interest_rate))
+        monthly_factor_12 = 1 + monthly_growth_12
+        one_year_sip_fv = monthly_sip_amount * (
+            monthly_growth_12 / monthly_interest_rate if monthly_interest_rate else 12.0
+        )
+
+        # The SIP follows a single recurrence over all years:
+        #     sip_values[i] = sip_values[i - 1] * sip_yearly_growth[i] + sip_increments[i]
+        # While the SIP is ongoing the balance compounds monthly for a year and one more year
+        # of contributions (one_year_sip_fv) is added; after it stops the accumulated value
+        # only compounds annually. With P = cumprod(sip_yearly_growth) the recurrence has the
+        # closed form sip_values = P * cumsum(sip_increments / P), evaluated without a loop.
+        sip_cumulative_growth = np.full(total_investment_duration_years, yearly_factor)
+        sip_cumulative_growth[:sip_duration_years] = monthly_factor_12
+        np.cumprod(sip_cumulative_growth, out=sip_cumulative_growth)
+
+        sip_values[:sip_duration_years] = one_year_sip_fv # The yearly SIP increments
+        np.divide(sip_values, sip_cumulative_growth, out=sip_values)
+        np.cumsum(sip_values, out=sip_values)
+        sip_values *= sip_cumulative_growth
+
+    if has_one_time and has_sip:
+        np.add(one_time_values, sip_values, out=total_values)
+    else:
+        # At most one part is non-zero, so it already is the total
+        np.copyto(total_values, sip_values if has_sip else one_time_values)
+
+    return one_time_values, sip_values, total_values
 
 # Define the investment calculation function (from previous turn)
 def calculate_investment_growth(
@@ -8,7 +82,8 @@ def calculate_investment_growth(
     monthly_sip_amount,
     annual_interest_rate_percent,
     sip_duration_years,
-    total_investment_duration_years
+    total_investment_duration_years,
+    include_timeseries=True
 ):
     """
     Simulates investment growth based on a one-time investment and monthly SIP.
@@ -20,21 +95,54 @@ def calculate_investment_growth(
         sip_duration_years (int): Duration for which monthly SIPs are made (e.g., 10 years).
         total_investment_duration_years (int): Total period the money remains invested
                                                (e.g., 20 years).
+        include_timeseries (bool): Whether to also compute the year-by-year values in
+                                   'growth_df'. Only the final values are needed
+                                   when the growth chart is not shown.
 
     Returns:
-        dict: A dictionary containing details of the investment simulation.
+        tuple: A (results, error) pair. results is a dictionary containing details of
+               the investment simulation, or None if the inputs are invalid, in which
+               case error holds the message to show to the user.
     """
 
-    if not all(isinstance(arg, (int, float)) and arg >= 0 for arg in [
-        one_time_investment, monthly_sip_amount, annual_interest_rate_percent,
-        sip_duration_years, total_investment_duration_years
-    ]):
-        st.error("All investment amounts, rates, and durations must be non-negative numbers.")
-        return None
+    # The Streamlit widgets already guarantee numeric inputs, so only the ranges are checked
+    if min(one_time_investment, monthly_sip_amount, annual_interest_rate_percent,
+           sip_duration_years, total_investment_duration_years) < 0:
+        return None, "All investment amounts, rates, and durations must be non-negative numbers."
 
     if total_investment_duration_years < sip_duration_years:
-        st.error("Total investment duration must be greater than or equal to SIP duration.")
-        return None
+        return None, "Total investment duration must be greater than or equal to SIP duration."
+
+    results = _calculate_investment_growth(
+        one_time_investment,
+        monthly_sip_amount,
+        annual_interest_rate_percent,
+        sip_duration_years,
+        total_investment_duration_years,
+        include_timeseries
+    )
+    return results, None
+
+# Validation happens in calculate_investment_growth, before the cache boundary.
+# Results are memoized so Streamlit reruns with unchanged inputs skip the computation
+@st.cache_data(show_spinner=False, max_entries=128)
+def _calculate_investment_growth(
+    one_time_investment,
+    monthly_sip_amount,
+    annual_interest_rate_percent,
+    sip_duration_years,
+    total_investment_duration_years,
+    include_timeseries
+):
+    """
+    Computes the investment simulation for already validated inputs.
+
+    Args:
+        See calculate_investment_growth.
+
+    Returns:
+        dict: A dictionary containing details of the investment simulation.
+    """
 
     # Convert annual percentage rate to a decimal monthly rate
     monthly_interest_rate = (annual_interest_rate_percent / 100) / 12
@@ -48,78 +156,68 @@ def calculate_investment_growth(
         'total_investment_duration_years': total_investment_duration_years,
         'total_contributed': 0,
         'final_value': 0,
-        'growth_over_time': [] # To store values for plotting
+        'growth_df': None # To store values for plotting
     }
 
     # --- 1. Calculate growth of One-Time Investment ---
     # This grows for the entire total_investment_duration_years
-    final_value_one_time = one_time_investment * ((1 + annual_interest_rate) ** total_investment_duration_years)
-    results['final_value_one_time_investment'] = round(final_value_one_time, 2)
+    final_value_one_time = one_time_investment * math.exp(total_investment_duration_years * math.log1p(annual_interest_rate))
+    results['final_value_one_time_investment'] = final_value_one_time
     results['total_contributed'] += one_time_investment
 
     # --- 2. Calculate growth of Monthly SIP ---
     final_value_sip_at_sip_end = 0
     if monthly_sip_amount > 0:
         # Calculate the future value of the annuity at the end of the SIP duration
+        # (the zero interest rate case is simply the sum of the contributions)
         num_sip_months = sip_duration_years * 12
-        if monthly_interest_rate > 0:
-            final_value_sip_at_sip_end = monthly_sip_amount * (((1 + monthly_interest_rate)**num_sip_months - 1) / monthly_interest_rate)
-        else: # Handle zero interest rate for SIP
-             final_value_sip_at_sip_end = monthly_sip_amount * num_sip_months
+        final_value_sip_at_sip_end = monthly_sip_amount * (
+            math.expm1(num_sip_months * math.log1p(monthly_interest_rate)) / monthly_interest_rate
+            if monthly_interest_rate else float(num_sip_months)
+        )
 
         results['total_contributed_sip'] = monthly_sip_amount * num_sip_months
         results['total_contributed'] += results['total_contributed_sip']
-        results['value_of_sip_at_sip_end'] = round(final_value_sip_at_sip_end, 2)
+        results['value_of_sip_at_sip_end'] = final_value_sip_at_sip_end
 
         # The SIP contributions stop after sip_duration_years, but that accumulated sum
         # then continues to grow for the remaining period until total_investment_duration_years
         holding_period_after_sip_end_years = total_investment_duration_years - sip_duration_years
-        final_value_sip_after_full_period = final_value_sip_at_sip_end * ((1 + annual_interest_rate) ** holding_period_after_sip_end_years)
-        results['final_value_monthly_sip'] = round(final_value_sip_after_full_period, 2)
+        final_value_sip_after_full_period = final_value_sip_at_sip_end * math.exp(holding_period_after_sip_end_years * math.log1p(annual_interest_rate))
+        results['final_value_monthly_sip'] = final_value_sip_after_full_period
     else:
         results['total_contributed_sip'] = 0
         results['value_of_sip_at_sip_end'] = 0
         results['final_value_monthly_sip'] = 0
 
     # --- 3. Total Final Value ---
-    results['final_value'] = round(final_value_one_time + results['final_value_monthly_sip'], 2)
-    results['total_earnings'] = round(results['final_value'] - results['total_contributed'], 2)
+    results['final_value'] = final_value_one_time + results['final_value_monthly_sip']
+    results['total_earnings'] = results['final_value'] - results['total_contributed']
+
+    if not include_timeseries:
+        return results
 
     # --- Data for plotting growth over time ---
-    current_one_time_value = one_time_investment
-    current_sip_value = 0
-    total_value_at_year_end = 0
-
-    for year in range(1, total_investment_duration_years + 1):
-        # Calculate one-time investment growth for the current year
-        current_one_time_value = one_time_investment * ((1 + annual_interest_rate) ** year)
-
-        # Calculate SIP growth for the current year
-        if year <= sip_duration_years:
-            # SIP is still ongoing, calculate value of annuity up to this year
-            num_sip_months_this_year = year * 12
-            if monthly_interest_rate > 0:
-                current_sip_value = monthly_sip_amount * (((1 + monthly_interest_rate)**num_sip_months_this_year - 1) / monthly_interest_rate)
-            else:
-                current_sip_value = monthly_sip_amount * num_sip_months_this_year
-        else:
-            # SIP has stopped, the accumulated value from sip_duration_years continues to grow
-            # We use the 'value_of_sip_at_sip_end' as the principal for the remaining years
-            # This logic assumes 'value_of_sip_at_sip_end' is correctly calculated at the end of SIP period
-            # and then compounds from that point.
-            # For plotting, we need to compound the *final* SIP value from SIP end year to current year
-            if sip_duration_years > 0 and results['value_of_sip_at_sip_end'] > 0:
-                current_sip_value = results['value_of_sip_at_sip_end'] * ((1 + annual_interest_rate) ** (year - sip_duration_years))
-            else:
-                current_sip_value = 0 # No SIP or SIP duration is 0
-
-        total_value_at_year_end = current_one_time_value + current_sip_value
-        results['growth_over_time'].append({
-            'year': year,
-            'one_time_value': round(current_one_time_value, 2),
-            'sip_value': round(current_sip_value, 2),
-            'total_value': round(total_value_at_year_end, 2)
-        })
+    # pandas is only needed for the yearly data, so it is imported here
+    import pandas as pd
+
+    one_time_values, sip_values, total_values = _simulate(
+        one_time_investment,
+        monthly_sip_amount,
+        annual_interest_rate,
+        monthly_interest_rate,
+        sip_duration_years,
+        total_investment_duration_years
+    )
+
+    # Stored as a DataFrame whose columns wrap the arrays, so they can be plotted directly;
+    # values are left unrounded and only formatted when displayed
+    results['growth_df'] = pd.DataFrame({
+        'year': np.arange(1, total_investment_duration_years + 1),
+        'one_time_value': one_time_values,
+        'sip_value': sip_values,
+        'total_value': total_values
+    })
 
     return results
 
@@ -184,16 +282,21 @@ if total_investment_duration_years < sip_duration_years:
         key="adjusted_total_duration" # Use a unique key for the adjusted slider
     )
 
+show_growth_chart = st.sidebar.checkbox("Show Growth Over Time Chart", value=True)
 
 if st.sidebar.button("Calculate Investment"):
-    results = calculate_investment_growth(
+    results, error = calculate_investment_growth(
         one_time_investment,
         monthly_sip_amount,
         annual_interest_rate_percent,
         sip_duration_years,
-        total_investment_duration_years
+        total_investment_duration_years,
+        include_timeseries=show_growth_chart
     )
 
+    if error:
+        st.error(error)
+
     if results:
         st.subheader("📊 Investment Summary")
 
@@ -201,17 +304,17 @@ if st.sidebar.button("Calculate Investment"):
         with col1:
             st.metric(
                 label="Total Amount Contributed",
-                value=f"₹ {results['total_contributed']:,}"
+                value=f"₹ {results['total_contributed']:,.2f}"
             )
         with col2:
             st.metric(
                 label=f"Final Value after {total_investment_duration_years} Years",
-                value=f"₹ {results['final_value']:,}"
+                value=f"₹ {results['final_value']:,.2f}"
             )
         with col3:
             st.metric(
                 label="Total Earnings (Profit)",
-                value=f"₹ {results['total_earnings']:,}"
+                value=f"₹ {results['total_earnings']:,.2f}"
             )
 
         st.markdown("---")
@@ -224,36 +327,32 @@ if st.sidebar.button("Calculate Investment"):
         st.write(f"**Total Investment Period:** {total_investment_duration_years} Years")
 
         st.write(f"---")
-        st.write(f"**Final Value from One-Time Investment:** ₹ {results['final_value_one_time_investment']:,}")
+        st.write(f"**Final Value from One-Time Investment:** ₹ {results['final_value_one_time_investment']:,.2f}")
         if monthly_sip_amount > 0:
-            st.write(f"**Total Contributed via SIP:** ₹ {results['total_contributed_sip']:,}")
-            st.write(f"**Value of SIP at end of Contribution Period ({sip_duration_years} years):** ₹ {results['value_of_sip_at_sip_end']:,}")
-            st.write(f"**Final Value from Monthly SIP (after full {total_investment_duration_years} years):** ₹ {results['final_value_monthly_sip']:,}")
+            st.write(f"**Total Contributed via SIP:** ₹ {results['total_contributed_sip']:,.2f}")
+            st.write(f"**Value of SIP at end of Contribution Period ({sip_duration_years} years):** ₹ {results['value_of_sip_at_sip_end']:,.2f}")
+            st.write(f"**Final Value from Monthly SIP (after full {total_investment_duration_years} years):** ₹ {results['final_value_monthly_sip']:,.2f}")
 
         st.markdown("---")
 
-        st.subheader("Growth Over Time")
+        if show_growth_chart:
+            st.subheader("Growth Over Time")
 
-        years = [d['year'] for d in results['growth_over_time']]
-        total_values = [d['total_value'] for d in results['growth_over_time']]
-        one_time_values = [d['one_time_value'] for d in results['growth_over_time']]
-        sip_values = [d['sip_value'] for d in results['growth_over_time']]
+            growth_df = results['growth_df'].set_index('year')
 
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.plot(years, total_values, label='Total Investment Value', color='blue', linewidth=2)
-        if one_time_investment > 0:
-            ax.plot(years, one_time_values, label='One-Time Investment Growth', linestyle='--', color='green')
-        if monthly_sip_amount > 0:
-            ax.plot(years, sip_values, label='Monthly SIP Growth', linestyle=':', color='orange')
+            # The chart is rendered in the browser from the raw values, so no image
+            # has to be drawn on the server for every calculation
+            chart_columns = {'total_value': 'Total Investment Value'}
+            if one_time_investment > 0:
+                chart_columns['one_time_value'] = 'One-Time Investment Growth'
+            if monthly_sip_amount > 0:
+                chart_columns['sip_value'] = 'Monthly SIP Growth'
 
-        ax.set_title('Investment Growth Over Time')
-        ax.set_xlabel('Years')
-        ax.set_ylabel('Value (₹)')
-        ax.grid(True)
-        ax.legend()
-        plt.tight_layout()
-        st.pyplot(fig)
+            chart_df = growth_df[list(chart_columns)].rename(columns=chart_columns)
+            # Rounded only for display, so the chart tooltips match the 2 decimal place note
+            st.line_chart(chart_df.round(2), x_label='Years', y_label='Value (₹)')
+
+            st.markdown("---")
 
-        st.markdown("---")
         st.info("Note: Values are rounded to 2 decimal places. Interest is compounded annually for the one-time investment and monthly for SIPs, then the accumulated SIP value is compounded annually for the remaining period.")
 